@@ -0,0 +1,80 @@
+import os
+import sys
+import tempfile
+import time
+
+import products
+import profiler
+import promotions
+import store
+
+
+def time_spans(count):
+    """
+    Measures the average time of one nested span pair of the session profiler
+    :param count: number of span pairs as int
+    :return: time per span pair in microseconds as float
+    """
+    start = time.perf_counter()
+    for _ in range(count):
+        with profiler.span("outer"):
+            with profiler.span("inner"):
+                pass
+    return (time.perf_counter() - start) / count * 1_000_000
+
+
+def time_orders(count):
+    """
+    Measures the average time of an order with two promoted products
+    :param count: number of orders as int
+    :return: time per order in microseconds as float
+    """
+    laptop = products.Product("Laptop", price=1450, quantity=10 ** 9)
+    laptop.promotion = promotions.ThirdOneFree("Third One Free!")
+    laptop.promotion = promotions.SecondHalfPrice("Second Half price!")
+    earbuds = products.Product("Earbuds", price=250, quantity=10 ** 9)
+    earbuds.promotion = promotions.PercentDiscount("30% off!", percent=30)
+    shop = store.Store([laptop, earbuds])
+    start = time.perf_counter()
+    for _ in range(count):
+        shop.order([(laptop, 3), (earbuds, 2)])
+    return (time.perf_counter() - start) / count * 1_000_000
+
+
+def time_write(session_profiler):
+    """
+    Measures writing the recorded stacks of a profiler to its output file
+    :param session_profiler: enabled Profiler instance
+    :return: time of the write in milliseconds and size of the file in bytes as tuple
+    """
+    start = time.perf_counter()
+    session_profiler.write()
+    elapsed = (time.perf_counter() - start) * 1000
+    return elapsed, os.path.getsize(session_profiler.output_path)
+
+
+def main():
+    """Compares span and order cost with the profiler disabled and enabled"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    results = {}
+
+    profiler.disable()
+    results["disabled"] = (time_spans(count), time_orders(count))
+
+    with tempfile.TemporaryDirectory() as directory:
+        session_profiler = profiler.configure(os.path.join(directory, "profile.folded"),
+                                              sample_rate=1.0)
+        results["enabled"] = (time_spans(count), time_orders(count))
+        write_time, file_size = time_write(session_profiler)
+    profiler.disable()
+
+    for mode, (span_time, order_time) in results.items():
+        print(f"profiler {mode}: {span_time:.2f} us per span pair, "
+              f"{order_time:.2f} us per order")
+    overhead = results["enabled"][1] / results["disabled"][1] - 1
+    print(f"order overhead with profiling enabled: {overhead:.1%}")
+    print(f"writing the profile: {write_time:.2f} ms for {file_size} bytes")
+
+
+if __name__ == "__main__":
+    main()
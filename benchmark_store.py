@@ -0,0 +1,124 @@
+import sys
+import threading
+import time
+
+import products
+import store
+
+
+class LockedStore:
+    """
+    Baseline store without catalog versions, reads and orders share one lock
+    and read the live products
+
+    Attributes:
+        _products (list): The list of products
+        _lock (Lock): Serializes reads and orders
+    """
+
+    def __init__(self, product_list):
+        """
+        Initializes a LockedStore instance
+        :param product_list: Product instances as list
+        """
+        self._products = list(product_list)
+        self._lock = threading.Lock()
+
+    def get_total_quantity(self):
+        """
+        Sums up the quantities of all products while holding the lock
+        :return: total quantity as str
+        """
+        with self._lock:
+            total_products = sum(product.quantity for product in self._products)
+        return f"Total of {total_products} items in store"
+
+    def get_all_products(self):
+        """
+        Gets all active products while holding the lock
+        :return: products in the store as list
+        """
+        with self._lock:
+            return [product for product in self._products if product.is_active()]
+
+    def order(self, shopping_list):
+        """
+        Processes the order while holding the lock, with the same purchase logic as Store
+        :param shopping_list: product/quantity tuples as list
+        :return: total price as str, else error message
+        """
+        with self._lock:
+            return store.Store._process_order(shopping_list)
+
+
+def create_store(store_class, product_count):
+    """
+    Creates a store stocked with enough products for the benchmark
+    :param store_class: Store or LockedStore class
+    :param product_count: number of products as int
+    :return: store instance
+    """
+    return store_class([products.Product(f"Product {index}", price=10, quantity=10 ** 9)
+                        for index in range(product_count)])
+
+
+def run_benchmark(store_class, readers=4, writers=2, duration=2.0, product_count=50):
+    """
+    Runs reader and writer threads against one store at the same time and
+    counts the operations they finish
+    :param store_class: Store or LockedStore class
+    :param readers: number of threads listing products and stock as int
+    :param writers: number of threads making orders as int
+    :param duration: runtime of the benchmark in seconds as float
+    :param product_count: number of products in the store as int
+    :return: read and write operations per second as tuple
+    """
+    shop = create_store(store_class, product_count)
+    stop = threading.Event()
+    counts = {"read": 0, "write": 0}
+    count_lock = threading.Lock()
+
+    def read():
+        operations = 0
+        while not stop.is_set():
+            shop.get_all_products()
+            shop.get_total_quantity()
+            operations += 1
+        with count_lock:
+            counts["read"] += operations
+
+    def write():
+        operations = 0
+        while not stop.is_set():
+            product_list = shop.get_all_products()
+            shop.order([(product_list[0], 1), (product_list[-1], 1)])
+            operations += 1
+        with count_lock:
+            counts["write"] += operations
+
+    threads = ([threading.Thread(target=read) for _ in range(readers)]
+               + [threading.Thread(target=write) for _ in range(writers)])
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return counts["read"] / duration, counts["write"] / duration
+
+
+def main():
+    """
+    Runs the benchmark for a few reader/writer mixes and prints the throughput
+    of the versioned Store next to the lock-based baseline
+    """
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    for readers, writers in ((1, 0), (0, 1), (4, 1), (4, 4), (1, 4)):
+        print(f"{readers} reader(s), {writers} writer(s):")
+        for name, store_class in (("versioned", store.Store), ("locked baseline", LockedStore)):
+            reads, writes = run_benchmark(store_class, readers, writers, duration)
+            print(f"    {name:>15}: {reads:>10,.0f} reads/s, {writes:>8,.0f} orders/s")
+
+
+if __name__ == "__main__":
+    main()
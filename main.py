@@ -1,9 +1,14 @@
+import argparse
+import os
+
 import products
+import profiler
 import promotions
 import store
 import user_input
 
 
+@profiler.profiled("menu:show_current_stock")
 def show_current_stock(shop):
     """
     Gets total quantity of all products in the shop
@@ -13,26 +18,31 @@ def show_current_stock(shop):
     print("----------")
 
 
-def show_products(shop):
+@profiler.profiled("menu:show_products")
+def show_products(shop, product_list=None):
     """
     Gets all products currently in the shop
     :param shop: Store class, loaded with products from Product class
+    :param product_list: snapshot of the shop products as list, taken from the shop if None
     """
     print("----------")
-    product_list = shop.get_all_products()
+    if product_list is None:
+        product_list = shop.get_all_products()
     for index, product in enumerate(product_list):
         print(f"{index + 1}. {product}")
     print("----------")
 
 
+@profiler.profiled("menu:make_order")
 def make_order(shop):
     """
     Creates a list of tuples with product and quantity from repeated user inputs,
     calls the order from the list
     :param shop: Store class, loaded with products from Product class
     """
-    show_products(shop)
+    # list and choose from the same snapshot, so the shown numbers match the products
     product_list = shop.get_all_products()
+    show_products(shop, product_list)
     print("When you want to finish order, enter empty text.")
     order_list = []
     while True:
@@ -76,11 +86,75 @@ def start(shop):
             menu_funct[menu_choice](shop)
 
 
+def profile_rate(value):
+    """
+    Converts the profile rate argument, raises exceptions
+    :param value: profile rate as str
+    :return: profile rate as float
+
+    Raises:
+        ArgumentTypeError: if the rate is not a number between 0 and 1
+    """
+    try:
+        rate = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Profile rate has to be a number: {value}")
+    if not 0 <= rate <= 1:
+        raise argparse.ArgumentTypeError(f"Profile rate has to be between 0 and 1: {value}")
+    return rate
+
+
+def profile_path(value):
+    """
+    Checks that the profile can be written to the path argument by opening it once,
+    raises exceptions
+    :param value: profile path as str
+    :return: profile path as str
+
+    Raises:
+        ArgumentTypeError: if the path cannot be opened for writing
+    """
+    existed = os.path.exists(value)
+    try:
+        with open(value, "a", encoding="utf-8"):
+            pass
+    except OSError as error:
+        raise argparse.ArgumentTypeError(f"Profile path is not writable: {error}")
+    # the profile is only written for sampled sessions, do not leave an empty file behind
+    if not existed:
+        os.remove(value)
+    return value
+
+
+def parse_arguments():
+    """
+    Gets the command line arguments
+    :return: parsed arguments as Namespace
+    """
+    parser = argparse.ArgumentParser(description="Best Buy store menu")
+    # argparse converts string defaults with the type, so the environment values are checked too
+    parser.add_argument("--profile", type=profile_path, metavar="PATH",
+                        default=os.environ.get("BESTBUY_PROFILE") or None,
+                        help="write a collapsed-stack profile of the session to PATH "
+                             "(default: BESTBUY_PROFILE environment variable)")
+    parser.add_argument("--profile-rate", type=profile_rate, metavar="RATE",
+                        default=os.environ.get("BESTBUY_PROFILE_RATE", "1"),
+                        help="fraction of sessions to profile, between 0 and 1 "
+                             "(default: BESTBUY_PROFILE_RATE environment variable or 1)")
+    return parser.parse_args()
+
+
 def main():
     """
     Creates a list of product instances, adds promotions
     and starts the menu interface, handles exceptions
     """
+    arguments = parse_arguments()
+    if arguments.profile:
+        session_profiler = profiler.configure(arguments.profile, arguments.profile_rate)
+    else:
+        session_profiler = profiler.disable()
+
     try:
         # setup initial stock of inventory
         product_list = [products.Product("MacBook Air M2", price=1450, quantity=100),
@@ -111,7 +185,11 @@ def main():
     except NameError as error:
         print(f"Error catching name: {error}")
     else:
-        start(best_buy)
+        try:
+            with session_profiler.span("session"):
+                start(best_buy)
+        finally:
+            session_profiler.write()
 
 
 if __name__ == "__main__":
@@ -1,3 +1,4 @@
+import profiler
 import promotions
 
 
@@ -11,6 +12,9 @@ class Product:
         _quantity (int): The available quantity of the product
         _active (bool): The status of the product, indicates whether the product is active
         promotion (list): List of Promotion class instances
+        _origin (Product): The live Product instance a snapshot copy was taken from
+        _frozen (bool): Whether the product is a read-only snapshot copy
+        _change_sets (tuple): Sets of the stores the product adds itself to when it changes
     """
 
     def __init__(self, name, price, quantity):
@@ -40,6 +44,80 @@ class Product:
         self.promotion = []
         self.activate()
         self.quantity = quantity
+        self._origin = self
+        self._change_sets = ()
+
+    @property
+    def origin(self):
+        """
+        Getter function. Gets the live product, is the product itself unless it is a snapshot
+        :return: live Product instance
+        """
+        return self._origin
+
+    def snapshot(self):
+        """
+        Creates a read-only point-in-time copy of the product, the copy keeps
+        a reference to the live product in its origin
+        :return: copy of the Product instance, the product itself if it is already a snapshot
+        """
+        if self.is_snapshot():
+            return self
+        # copy the attributes directly, copy.copy is several times slower and runs on every order
+        product_copy = object.__new__(type(self))
+        product_copy.__dict__.update(self.__dict__, _promotion=tuple(self._promotion or ()),
+                                     _change_sets=(), _frozen=True)
+        return product_copy
+
+    def add_change_set(self, changes):
+        """
+        Registers a set the product adds itself to whenever one of its attributes changes,
+        used by stores to republish their catalog
+        :param changes: set of changed products
+        """
+        self._change_sets += (changes,)
+
+    def remove_change_set(self, changes):
+        """
+        Unregisters a set added with add_change_set
+        :param changes: set of changed products
+        """
+        self._change_sets = tuple(change_set for change_set in self._change_sets
+                                  if change_set is not changes)
+
+    def is_snapshot(self):
+        """
+        Gets whether the product is a read-only snapshot copy
+        :return: True if the product is a snapshot copy, else False
+        """
+        return "_frozen" in self.__dict__
+
+    def _check_writable(self):
+        """
+        Checks that the product can be changed
+
+        Raises:
+            AttributeError: if the product is a snapshot copy
+        """
+        if self.is_snapshot():
+            raise AttributeError(f"Snapshot of {self.name} is read-only, "
+                                 f"change the product in its origin")
+
+    def __setattr__(self, name, value):
+        """
+        Magic method. Sets an attribute and marks the product as changed
+        in the stores it belongs to, raises exceptions
+        :param name: name of the attribute as str
+        :param value: new value of the attribute
+
+        Raises:
+            AttributeError: if the product is a snapshot copy
+        """
+        if "_frozen" in self.__dict__:
+            self._check_writable()
+        super().__setattr__(name, value)
+        for changes in self.__dict__.get("_change_sets", ()):
+            changes.add(self)
 
     @property
     def quantity(self):
@@ -138,7 +216,9 @@ class Product:
 
         Raises:
             ValueError: if product is inactive or quantity exceeds the available product quantity
+            AttributeError: if the product is a snapshot copy
         """
+        self._check_writable()
         if not self.is_active():
             raise ValueError("Product Inactive")
         if self.quantity - quantity < 0:
@@ -178,17 +258,20 @@ class Product:
         promo = next((promotion for promotion in self.promotion
                       if isinstance(promotion, promotions.ThirdOneFree)), None)
         if promo:
-            quantity = promo.apply_promotion(self.name, quantity)
+            with profiler.span("promotion", promo.name):
+                quantity = promo.apply_promotion(self.name, quantity)
 
         promo = next((promotion for promotion in self.promotion
                       if isinstance(promotion, promotions.SecondHalfPrice)), None)
         if promo:
-            quantity = promo.apply_promotion(self.name, quantity)
+            with profiler.span("promotion", promo.name):
+                quantity = promo.apply_promotion(self.name, quantity)
 
         promo = next((promotion for promotion in self.promotion
                       if isinstance(promotion, promotions.PercentDiscount)), None)
         if promo:
-            quantity = promo.apply_promotion(self.name, quantity)
+            with profiler.span("promotion", promo.name):
+                quantity = promo.apply_promotion(self.name, quantity)
 
         return quantity
 
@@ -223,7 +306,11 @@ class NonStockedProduct(Product):
         gets amount the order was bought for by multiplying price with quantity
         :param quantity: amount of items bought as int
         :return: overall price as float
+
+        Raises:
+            AttributeError: if the product is a snapshot copy
         """
+        self._check_writable()
         quantity = self.get_promotions(quantity)
         return self.price * quantity
 
@@ -267,7 +354,9 @@ class LimitedProduct(Product):
 
         Raises:
             ValueError: if product is inactive, more than maximum or too high quantity is bought
+            AttributeError: if the product is a snapshot copy
         """
+        self._check_writable()
         if not self.is_active():
             raise ValueError("Product Inactive")
         if quantity > self.maximum:
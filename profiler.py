@@ -0,0 +1,188 @@
+import contextlib
+import functools
+import random
+import threading
+import time
+
+OVERFLOW_STACK = "[truncated]"
+
+
+class Profiler:
+    """
+    Represents a tracing profiler that measures the time spent in named spans and
+    writes it as collapsed stacks ("outer;inner microseconds" per line), which
+    flamegraph tools like flamegraph.pl or speedscope can read
+
+    Attributes:
+        output_path (str): path of the collapsed-stack file, None if disabled
+        enabled (bool): whether this session is profiled
+        max_stacks (int): maximum number of distinct stacks kept, bounds the memory use
+        _stacks (dict): self time in microseconds per collapsed stack
+        _local (local): the open spans of each thread
+        _lock (Lock): protects the stacks of concurrent threads
+    """
+
+    def __init__(self, output_path=None, sample_rate=1.0, max_stacks=10000):
+        """
+        Initializes a Profiler instance, decides once if this session is sampled
+        :param output_path: path of the collapsed-stack file as str, None to disable
+        :param sample_rate: fraction of sessions that are profiled as float between 0 and 1
+        :param max_stacks: maximum number of distinct stacks as int
+
+        Raises:
+            ValueError: if sample rate is not between 0 and 1 or max stacks is not positive
+        """
+        if not 0 <= sample_rate <= 1:
+            raise ValueError(f"Sample rate has to be between 0 and 1: {sample_rate}")
+        if max_stacks < 1:
+            raise ValueError(f"Maximum stacks has to be positive: {max_stacks}")
+        self.output_path = output_path
+        self.enabled = output_path is not None and random.random() < sample_rate
+        self.max_stacks = max_stacks
+        self._stacks = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def span(self, *name_parts):
+        """
+        Creates a context manager that measures the time spent inside it,
+        does nothing if the profiler is disabled. The name parts are only
+        joined with ":" when the span is recorded
+        :param name_parts: parts of the span name as str
+        :return: context manager
+        """
+        if not self.enabled:
+            return _NO_SPAN
+        return _Span(self, ":".join(name_parts))
+
+    def _record(self, names, self_time):
+        """
+        Adds the self time of a span to its collapsed stack
+        :param names: span names from the outermost to the current span as list
+        :param self_time: time spent in the span without its children in seconds as float
+        """
+        stack = ";".join(names)
+        with self._lock:
+            if stack not in self._stacks and len(self._stacks) >= self.max_stacks:
+                stack = OVERFLOW_STACK
+            self._stacks[stack] = self._stacks.get(stack, 0) + self_time * 1_000_000
+
+    def get_stacks(self):
+        """
+        Gets the recorded collapsed stacks
+        :return: self time in whole microseconds per stack as dict
+        """
+        with self._lock:
+            return {stack: round(micro) for stack, micro in self._stacks.items()}
+
+    def write(self):
+        """
+        Writes the recorded stacks to the output file, does nothing if disabled,
+        handles exceptions
+        """
+        if not self.enabled:
+            return
+        try:
+            with open(self.output_path, "w", encoding="utf-8") as file:
+                for stack, micro in sorted(self.get_stacks().items()):
+                    file.write(f"{stack} {micro}\n")
+        except OSError as error:
+            print(f"Error writing the profile: {error}")
+
+
+class _Span:
+    """
+    Represents one measured span of an enabled Profiler instance
+
+    Attributes:
+        _profiler (Profiler): the Profiler instance the span reports to
+        _name (str): name of the span
+        _start (float): start time of the span
+        _child_time (float): time spent in nested spans
+    """
+
+    __slots__ = ("_profiler", "_name", "_start", "_child_time")
+
+    def __init__(self, profiler, name):
+        """
+        Initializes a span, semicolons are replaced as they separate the stack frames
+        :param profiler: Profiler instance
+        :param name: name of the span as str
+        """
+        self._profiler = profiler
+        self._name = name.replace(";", ":")
+        self._child_time = 0.0
+
+    def __enter__(self):
+        """Pushes the span on the thread's span stack and starts the timer"""
+        local = self._profiler._local
+        if not hasattr(local, "spans"):
+            local.spans = []
+        local.spans.append(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stops the timer, records the self time and pops the span"""
+        elapsed = time.perf_counter() - self._start
+        spans = self._profiler._local.spans
+        self._profiler._record([span._name for span in spans], elapsed - self._child_time)
+        spans.pop()
+        if spans:
+            spans[-1]._child_time += elapsed
+        return False
+
+
+_NO_SPAN = contextlib.nullcontext()
+
+# the profiler of the running session, replaced by configure() and disable()
+profiler = Profiler()
+
+
+def configure(output_path, sample_rate=1.0):
+    """
+    Replaces the session profiler
+    :param output_path: path of the collapsed-stack file as str
+    :param sample_rate: fraction of sessions that are profiled as float
+    :return: the new Profiler instance
+
+    Raises:
+        ValueError: if the sample rate is not between 0 and 1
+    """
+    global profiler
+    profiler = Profiler(output_path, sample_rate)
+    return profiler
+
+
+def disable():
+    """
+    Replaces the session profiler with a disabled one
+    :return: the new Profiler instance
+    """
+    global profiler
+    profiler = Profiler()
+    return profiler
+
+
+def span(*name_parts):
+    """
+    Creates a span of the session profiler
+    :param name_parts: parts of the span name as str
+    :return: context manager
+    """
+    return profiler.span(*name_parts)
+
+
+def profiled(name):
+    """
+    Decorator. Measures every call of the decorated function as a span
+    :param name: name of the span as str
+    :return: decorator
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with profiler.span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
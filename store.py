@@ -1,9 +1,22 @@
+import threading
+
+import profiler
+
+
 class Store:
     """
-    Represents a store.
+    Represents a store. Reads come from the last published catalog snapshot. Orders,
+    added and removed products publish a new snapshot. Stocked products mark themselves
+    as changed when they are changed directly, and the next read or order publishes them.
 
     Attributes:
-        _products (list): The list of products
+        _products (list): The list of live products
+        _positions (dict): positions of each live product in the product list
+        _changed (set): live products changed since the last published catalog
+        _catalog (tuple): Version number and snapshot copies of all products as tuple,
+            lined up with the product list and replaced as a whole (copy-on-write)
+            after every change
+        _write_lock (Lock): Serializes changes to the products
     """
 
     def __init__(self, product_list=None):
@@ -12,6 +25,10 @@ class Store:
         :param product_list: Product instances as list
         """
         self._products = []
+        self._positions = {}
+        self._changed = set()
+        self._catalog = (0, ())
+        self._write_lock = threading.Lock()
         if product_list:
             for product in product_list:
                 self.add_product(product)
@@ -25,27 +42,88 @@ class Store:
         combined_products = self.get_all_products() + other.get_all_products()
         return Store(combined_products)
 
+    def _publish(self):
+        """
+        Publishes a new catalog version, has to be called while holding the write lock.
+        Only the changed products are copied in their position, the others are shared
+        with the previous version
+        """
+        version, catalog = self._catalog
+        catalog = list(catalog)
+        # pop before copying, so products changed meanwhile stay marked for the next version
+        while self._changed:
+            product = self._changed.pop()
+            for position in self._positions.get(product, ()):
+                catalog[position] = product.snapshot()
+        self._catalog = (version + 1, tuple(catalog))
+
+    def _get_catalog(self):
+        """
+        Gets the current catalog, publishes directly changed products first unless an
+        order holds the write lock, readers never wait as that order publishes them
+        :return: version and snapshot copies of all products as tuple
+        """
+        if self._changed and self._write_lock.acquire(blocking=False):
+            try:
+                self._publish()
+            finally:
+                self._write_lock.release()
+        return self._catalog
+
+    def _rebuild(self):
+        """
+        Rebuilds the positions and publishes a catalog of all products,
+        has to be called while holding the write lock
+        """
+        self._changed.clear()
+        self._positions = {}
+        for position, product in enumerate(self._products):
+            self._positions.setdefault(product, []).append(position)
+        version, _ = self._catalog
+        self._catalog = (version + 1, tuple(product.snapshot() for product in self._products))
+
     def add_product(self, product):
         """
         Adds a product to the list
         :param product:  Instance of a Product class
         """
-        self._products.append(product)
+        product = product.origin
+        with self._write_lock:
+            if product not in self._positions:
+                product.add_change_set(self._changed)
+            self._positions.setdefault(product, []).append(len(self._products))
+            self._products.append(product)
+            version, catalog = self._catalog
+            self._catalog = (version + 1, catalog + (product.snapshot(),))
 
     def remove_product(self, product):
         """
         Removes a product from the list
         :param product: instance of a Product class
         """
-        self._products.remove(product)
+        product = product.origin
+        with self._write_lock:
+            self._products.remove(product)
+            self._rebuild()
+            if product not in self._positions:
+                product.remove_change_set(self._changed)
+
+    def get_catalog_version(self):
+        """
+        Gets the version number of the current catalog snapshot,
+        it increases with every change to the products
+        :return: version as int
+        """
+        return self._get_catalog()[0]
 
     def get_total_quantity(self):
         """
-        Sums up the quantities of all products in the store
+        Sums up the quantities of all products in the store from one consistent snapshot
         :return: total quantity as int
         """
+        _, catalog = self._get_catalog()
         total_products = 0
-        for product in self._products:
+        for product in catalog:
             total_products += product.quantity
         return f"Total of {total_products} items in store"
 
@@ -55,27 +133,45 @@ class Store:
         :param item: the Product instance
         :return: True if Product instance is present in Store instance, else False
         """
-        for product in self._products:
+        _, catalog = self._get_catalog()
+        for product in catalog:
             if product.name == item.name:
                 return True
         return False
 
     def get_all_products(self):
         """
-        Gets all products in the store
+        Gets all products in the store as read-only snapshot copies of one
+        consistent point in time, without blocking orders
         :return: products in the store as list
         """
+        _, catalog = self._get_catalog()
         active_products = []
-        for product in self._products:
+        for product in catalog:
             if product.is_active():
                 active_products.append(product)
         return active_products
 
-    @staticmethod
-    def order(shopping_list):
+    def order(self, shopping_list):
         """
         Processes the orders from the customers, handles exceptions
-        :param shopping_list: product/quantity tuples as list
+        :param shopping_list: product/quantity tuples as list, products can be snapshot copies
+        :return: total price as float, else error message
+        """
+        shopping_list = [(product.origin, quantity) for product, quantity in shopping_list]
+        with profiler.span("order"):
+            with self._write_lock:
+                try:
+                    return self._process_order(shopping_list)
+                finally:
+                    with profiler.span("publish"):
+                        self._publish()
+
+    @staticmethod
+    def _process_order(shopping_list):
+        """
+        Buys the products of the order, rolls back the quantities if one purchase fails
+        :param shopping_list: live product/quantity tuples as list
         :return: total price as float, else error message
         """
         total_price = 0
@@ -83,10 +179,12 @@ class Store:
         for product, quantity in shopping_list:
             try:
                 original_quantity.append(product.quantity)
-                total_price += product.buy(quantity)
+                with profiler.span("buy", product.name):
+                    total_price += product.buy(quantity)
             except ValueError as error:
-                for index, refund_quantity in enumerate(original_quantity[:-1]):
-                    shopping_list[index][0].quantity = refund_quantity
+                with profiler.span("rollback"):
+                    for index, refund_quantity in enumerate(original_quantity[:-1]):
+                        shopping_list[index][0].quantity = refund_quantity
                 return (f"Error while making order: {error}")
 
         return f"Total order price: ${round(total_price, 2)}"
@@ -0,0 +1,67 @@
+import pytest
+
+import products
+import profiler
+import promotions
+import store
+
+
+@pytest.fixture
+def session_profiler(tmp_path):
+    """Enables the session profiler for one test and disables it afterward"""
+    yield profiler.configure(str(tmp_path / "profile.folded"), sample_rate=1.0)
+    profiler.disable()
+
+
+def test_disabled_profiler_records_nothing():
+    """Tests that spans of a disabled Profiler instance are not recorded"""
+    test = profiler.Profiler()
+    with test.span("order"):
+        pass
+    assert not test.enabled
+    assert test.get_stacks() == {}
+
+
+def test_nested_spans_record_collapsed_stacks():
+    """Tests that nested spans are recorded as semicolon separated stacks"""
+    test = profiler.Profiler("unused.folded")
+    with test.span("order"):
+        with test.span("buy", "te;st"):
+            pass
+    assert set(test.get_stacks()) == {"order", "order;buy:te:st"}
+
+
+def test_stacks_are_bounded():
+    """Tests that stacks above the maximum are counted in the overflow stack"""
+    test = profiler.Profiler("unused.folded", max_stacks=1)
+    for name in ("first", "second", "third"):
+        with test.span(name):
+            pass
+    assert set(test.get_stacks()) == {"first", profiler.OVERFLOW_STACK}
+
+
+def test_invalid_sample_rate():
+    """Tests Profiler instance creation with a sample rate above one"""
+    with pytest.raises(ValueError, match="Sample rate has to be between 0 and 1"):
+        profiler.Profiler("unused.folded", sample_rate=2)
+
+
+def test_order_writes_flamegraph_file(session_profiler):
+    """Tests that an order records order, buy and promotion spans in the written file"""
+    test = products.Product("test", price=10, quantity=100)
+    test.promotion = promotions.ThirdOneFree("Third One Free!")
+    store.Store([test]).order([(test, 3)])
+    session_profiler.write()
+    with open(session_profiler.output_path, encoding="utf-8") as file:
+        stacks = [line.rsplit(" ", 1)[0] for line in file]
+    assert "order;buy:test;promotion:Third One Free!" in stacks
+    assert "order;publish" in stacks
+
+
+def test_write_to_missing_directory(tmp_path, capsys):
+    """Tests that a profile that cannot be written prints an error instead of raising"""
+    test = profiler.Profiler(str(tmp_path / "missing" / "profile.folded"))
+    with test.span("order"):
+        pass
+    test.write()
+    assert capsys.readouterr().out.startswith("Error writing the profile:")
@@ -0,0 +1,113 @@
+import threading
+
+import pytest
+
+import products
+import promotions
+import store
+
+
+def create_store():
+    """Creates a Store instance with two stocked products"""
+    return store.Store([products.Product("test", price=10, quantity=100),
+                        products.Product("other", price=20, quantity=100)])
+
+
+def test_order_updates_snapshot():
+    """Tests that an order publishes a new catalog version with the updated quantity"""
+    shop = create_store()
+    version = shop.get_catalog_version()
+    product = shop.get_all_products()[0]
+    shop.order([(product, 40)])
+    assert shop.get_catalog_version() > version
+    assert shop.get_all_products()[0].quantity == 60
+    assert shop.get_total_quantity() == "Total of 160 items in store"
+
+
+def test_snapshot_is_not_changed_by_order():
+    """Tests that products from an earlier snapshot keep their point-in-time quantity"""
+    shop = create_store()
+    old_snapshot = shop.get_all_products()
+    shop.order([(old_snapshot[0], 100)])
+    assert old_snapshot[0].quantity == 100
+    assert len(shop.get_all_products()) == 1
+
+
+def test_failed_order_rolls_back_snapshot():
+    """Tests that a failed order publishes the rolled back quantities"""
+    shop = create_store()
+    first, second = shop.get_all_products()
+    result = shop.order([(first, 10), (second, 101)])
+    assert result.startswith("Error while making order")
+    assert shop.get_total_quantity() == "Total of 200 items in store"
+
+
+def test_concurrent_reads_see_consistent_totals():
+    """Tests that readers never see a half applied order while orders run concurrently"""
+    shop = create_store()
+    inconsistent = []
+
+    def read():
+        for _ in range(2000):
+            total = sum(product.quantity for product in shop.get_all_products())
+            if total % 2:
+                inconsistent.append(total)
+
+    def write():
+        for _ in range(50):
+            first, second = shop.get_all_products()
+            shop.order([(first, 1), (second, 1)])
+
+    threads = [threading.Thread(target=read), threading.Thread(target=write)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not inconsistent
+    assert shop.get_total_quantity() == "Total of 100 items in store"
+
+
+def test_listed_product_cannot_change_catalog():
+    """Tests that changing a listed snapshot product raises and leaves the catalog unchanged"""
+    shop = create_store()
+    listed = shop.get_all_products()[0]
+    with pytest.raises(AttributeError, match="read-only"):
+        listed.buy(2)
+    with pytest.raises(AttributeError, match="read-only"):
+        listed.quantity = 0
+    with pytest.raises(AttributeError, match="read-only"):
+        listed.deactivate()
+    assert shop.get_total_quantity() == "Total of 200 items in store"
+    assert listed.origin.quantity == 100
+
+
+def test_direct_changes_are_published():
+    """Tests that direct changes to a stocked product are published on the next read"""
+    shop = create_store()
+    product = shop.get_all_products()[0].origin
+    old_snapshot = shop.get_all_products()
+    product.quantity = 3
+    product.deactivate()
+    product.promotion = promotions.ThirdOneFree("Third One Free!")
+    assert shop.get_total_quantity() == "Total of 103 items in store"
+    assert len(shop.get_all_products()) == 1
+    assert not old_snapshot[0].promotion
+
+
+def test_product_without_promotions_is_listed():
+    """Tests that a product with promotions cleared to None can be stocked and listed"""
+    test = products.Product("test", price=10, quantity=100)
+    test.promotion = None
+    shop = store.Store([test])
+    assert shop.get_all_products()[0].promotion == ()
+
+
+def test_removed_product_no_longer_marks_store():
+    """Tests that a removed product stops marking the store as changed"""
+    shop = create_store()
+    product = shop.get_all_products()[0].origin
+    shop.remove_product(product)
+    version = shop.get_catalog_version()
+    product.quantity = 5
+    assert shop.get_catalog_version() == version
+    assert shop.get_total_quantity() == "Total of 100 items in store"
@@ -1,18 +1,24 @@
+import profiler
+
+
 def main_menu_input():
     """
     Gets user input for the main menu option, handles exceptions
     :return: user input as int
     """
     while True:
-        try:
-            menu_input = int(input("Please choose a number: "))
-        except ValueError:
-            print("Error. Please enter a number between 1-4.")
-        else:
-            if 1 <= menu_input <= 4:
-                return menu_input
-            else:
+        with profiler.span("input:wait"):
+            menu_input = input("Please choose a number: ")
+        with profiler.span("input:main_menu"):
+            try:
+                menu_input = int(menu_input)
+            except ValueError:
                 print("Error. Please enter a number between 1-4.")
+            else:
+                if 1 <= menu_input <= 4:
+                    return menu_input
+                else:
+                    print("Error. Please enter a number between 1-4.")
 
 
 def order_item_input(product_list):
@@ -23,14 +29,16 @@ def order_item_input(product_list):
     :return: number that represents the item in the shop as int or empty string
     """
     while True:
-        item_input = input("Which product # do you want? ")
-        if not item_input:
-            return item_input
-        elif (item_input.isnumeric()
-              and 1 <= int(item_input) <= len(product_list)):
-            return int(item_input)
-        else:
-            print("Error. Please enter a valid product number or leave the input blank.")
+        with profiler.span("input:wait"):
+            item_input = input("Which product # do you want? ")
+        with profiler.span("input:order_item"):
+            if not item_input:
+                return item_input
+            elif (item_input.isnumeric()
+                  and 1 <= int(item_input) <= len(product_list)):
+                return int(item_input)
+            else:
+                print("Error. Please enter a valid product number or leave the input blank.")
 
 
 def order_quantity_input():
@@ -40,10 +48,12 @@ def order_quantity_input():
     :return: quantity to buy as int or empty string
     """
     while True:
-        quantity = input("What amount do you want? ")
-        if not quantity:
-            return quantity
-        elif quantity.isnumeric():
-            return int(quantity)
-        else:
-            print("Error. Please enter a number or leave the input blank.")
+        with profiler.span("input:wait"):
+            quantity = input("What amount do you want? ")
+        with profiler.span("input:order_quantity"):
+            if not quantity:
+                return quantity
+            elif quantity.isnumeric():
+                return int(quantity)
+            else:
+                print("Error. Please enter a number or leave the input blank.")